@@ -3,27 +3,54 @@ import logging
 import motor.motor_asyncio
 from dotenv import load_dotenv
 
+from app.util.tracing_utilities import start_span
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure Logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize MongoDB client
-MONGO_URI = os.environ.get("MONGO_URI")
+# MongoDB client is created on first use (or by init_mongo in the API lifespan hook)
+# so importing this module does not open a connection.
+mongo_client = None
+db = None
+
 
-if not MONGO_URI:
-    logger.error("Missing environment variable: MONGO_URI")
-    raise EnvironmentError("MONGO_URI environment variable not set.")
+def init_mongo():
+    """
+    Initialize the MongoDB client and database handle if not already initialized.
 
-try:
-    mongo_client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
-    db = mongo_client["db"]  # Customize this to your actual database name
-    logger.info("Successfully connected to MongoDB.")
-except Exception as e:
-    logger.exception("Unable to connect to MongoDB: %s", e)
-    raise
+    :return: The database handle
+    """
+    global mongo_client, db
+    if db is not None:
+        return db
+
+    mongo_uri = os.environ.get("MONGO_URI")
+    if not mongo_uri:
+        logger.error("Missing environment variable: MONGO_URI")
+        raise EnvironmentError("MONGO_URI environment variable not set.")
+
+    try:
+        mongo_client = motor.motor_asyncio.AsyncIOMotorClient(mongo_uri)
+        db = mongo_client["db"]  # Customize this to your actual database name
+        logger.info("Successfully connected to MongoDB.")
+    except Exception as e:
+        logger.exception("Unable to connect to MongoDB: %s", e)
+        raise
+    return db
+
+
+def close_mongo():
+    """
+    Close the MongoDB client, if one was created.
+    """
+    global mongo_client, db
+    if mongo_client is not None:
+        mongo_client.close()
+        logger.info("MongoDB client closed.")
+    mongo_client = None
+    db = None
 
 
 async def persist_sentiment_data(data: dict) -> str:
@@ -33,11 +60,12 @@ async def persist_sentiment_data(data: dict) -> str:
     :param data: Sentiment data dictionary to persist
     :return: ID of the inserted document
     """
-    collection = db["sentiment_collection"]
+    collection = init_mongo()["sentiment_collection"]
     try:
-        result = await collection.insert_one(data)
+        with start_span("mongo.insert_one", collection="sentiment_collection"):
+            result = await collection.insert_one(data)
         document_id = str(result.inserted_id)
-        logger.info("Successfully inserted sentiment data with ID: %s", document_id)
+        logger.debug("Successfully inserted sentiment data with ID: %s", document_id)
         return document_id
     except Exception as e:
         logger.exception("Failed to insert sentiment data: %s", e)
@@ -51,11 +79,12 @@ async def persist_request_data(data: dict) -> str:
     :param data: Request data dictionary to persist
     :return: ID of the inserted document
     """
-    collection = db["request_collection"]
+    collection = init_mongo()["request_collection"]
     try:
-        result = await collection.insert_one(data)
+        with start_span("mongo.insert_one", collection="request_collection"):
+            result = await collection.insert_one(data)
         document_id = str(result.inserted_id)
-        logger.info("Successfully inserted request data with ID: %s", document_id)
+        logger.debug("Successfully inserted request data with ID: %s", document_id)
         return document_id
     except Exception as e:
         logger.exception("Failed to insert request data: %s", e)
@@ -1,12 +1,24 @@
 # Updated imports
-from fastapi import FastAPI, HTTPException, Depends
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from redis import Redis
+import asyncio
+import importlib
 import os
-from app.task.sentiment_based_staking_task import celery_app
-from app.services.tao_staking_service import fetch_tao_dividends, fetch_all_netuids, fetch_all_hotkeys_for_netuid
+from app.task.celery_app import celery_app
 from app.util.cache_utilities import get_cached_data, set_cache
-from app.db.mongo_persistence import persist_request_data
+from app.util.idempotency_utilities import build_idempotency_key, reserve_task_id, release_task_id
+from app.util.subnet_index_utilities import (
+    store_subnet_snapshots, get_subnet_stats, get_top_hotkeys, get_hotkey_rank
+)
+from app.util.tracing_utilities import start_span, inject, extract
+from app.util.logging_utilities import configure_logging
+from app.db.mongo_persistence import persist_request_data, init_mongo, close_mongo
 
 from dotenv import load_dotenv
 import logging
@@ -15,35 +27,137 @@ from datetime import datetime
 
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,  # Set log level to INFO (change to DEBUG for more detailed logs)
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Central logging configuration (JSON output, per-module levels, queue-based handler)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+STAKING_SERVICE_MODULE = "app.services.tao_staking_service"
+
+# Subnet dividend snapshots (aggregates and ranking index) expire with the dividend cache
+SNAPSHOT_TTL = int(os.environ.get("CACHE_TTL", 120))
+
+# Redis client is initialized in the lifespan hook
+redis_client = None
+
+_import_seconds = time.perf_counter() - _import_started
+
+
+# Chain/staking service module, set once its import has completed
+_staking_module = None
+
+
+async def _staking_service():
+    """
+    Import the chain/staking service (bittensor, substrate) on first use, so API workers
+    boot without it. The import runs in a thread so it does not stall the event loop.
+    Subsequent calls return the cached module.
+    """
+    global _staking_module
+    if _staking_module is None:
+        started = time.perf_counter()
+        module = await asyncio.to_thread(importlib.import_module, STAKING_SERVICE_MODULE)
+        if _staking_module is None:
+            _staking_module = module
+            logger.info("Loaded %s in %.1f ms.", STAKING_SERVICE_MODULE, (time.perf_counter() - started) * 1000)
+    return _staking_module
+
+
+def _log_preload_failure(task: asyncio.Task):
+    # Retrieve the preload result so a failed import is logged rather than lost
+    if not task.cancelled() and task.exception() is not None:
+        logger.exception("Failed to preload %s.", STAKING_SERVICE_MODULE, exc_info=task.exception())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize Redis and MongoDB clients when the worker starts and close them on shutdown.
+    """
+    global redis_client
+    started = time.perf_counter()
+    redis_client = Redis(
+        host=os.environ.get("REDIS_HOST"),
+        port=int(os.environ.get("REDIS_PORT"))
+    )
+    init_mongo()
+    clients_seconds = time.perf_counter() - started
+
+    app.state.startup_report = {
+        "pid": os.getpid(),
+        "import_ms": round(_import_seconds * 1000, 1),
+        "clients_ms": round(clients_seconds * 1000, 1),
+        "total_ms": round((time.perf_counter() - _import_started) * 1000, 1),
+    }
+    logger.info("Worker startup report: %s", app.state.startup_report)
+
+    # Warm the staking service in the background once the worker is serving requests
+    app.state.staking_service_preload = asyncio.create_task(_staking_service())
+    app.state.staking_service_preload.add_done_callback(_log_preload_failure)
+
+    yield
+
+    # Stop waiting on an unfinished preload before closing the clients; a finished one
+    # has already been checked by _log_preload_failure
+    preload = app.state.staking_service_preload
+    if not preload.done():
+        preload.cancel()
+        with suppress(asyncio.CancelledError):
+            await preload
+    redis_client.close()
+    close_mongo()
+
+
 # Initialize FastAPI application
-app = FastAPI(title="Asynchronous Dividends API")
-redis_client = Redis(
-    host=os.environ.get("REDIS_HOST"),
-    port=int(os.environ.get("REDIS_PORT"))
-)
+app = FastAPI(title="Asynchronous Dividends API", lifespan=lifespan)
 
 # Bearer token authentication
 security = HTTPBearer()
 
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    # Root span per request, continuing the caller's trace if a traceparent header is sent
+    with extract(request.headers):
+        with start_span(f"{request.method} {request.url.path}", method=request.method,
+                        path=request.url.path) as span:
+            response = await call_next(request)
+            span.set_attribute("status_code", response.status_code)
+            response.headers["X-Trace-Id"] = span.trace_id
+            return response
+
+
+def _authorize(token: HTTPAuthorizationCredentials):
+    # Validate Bearer Token
+    logger.debug("Validating the authorization token.")
+    with start_span("auth"):
+        if token.credentials != os.environ.get("AUTH_TOKEN"):
+            raise HTTPException(status_code=401, detail="Invalid or missing token")
+
+
+async def _subnet_stats(netuid: int) -> tuple[dict, bool]:
+    """
+    Return the precomputed aggregates of a netuid and whether they came from the snapshot,
+    refreshing the snapshot from the chain if there is none.
+    """
+    stats = get_subnet_stats(redis_client, netuid)
+    if stats is not None:
+        return stats, True
+
+    logger.info("No dividend snapshot for netuid=%s. Refreshing from the chain.", netuid)
+    dividends_for_netuid = await (await _staking_service()).fetch_all_hotkeys_for_netuid(netuid)
+    stats = store_subnet_snapshots(redis_client, {netuid: dividends_for_netuid}, ttl=SNAPSHOT_TTL)
+    return stats[netuid], False
+
+
 @app.get("/api/v1/tao_dividends")
 async def tao_dividends(
         netuid: int | None = None,
         hotkey: str | None = None,
         trade: bool = False,
+        idempotency_key: str | None = Header(default=None),
         token: HTTPAuthorizationCredentials = Depends(security),
 ):
-    # Validate Bearer Token
-    logger.info("Validating the authorization token.")
-    if token.credentials != os.environ.get("AUTH_TOKEN"):
-        raise HTTPException(status_code=401, detail="Invalid or missing token")
+    _authorize(token)
 
     request_log_data = {
         "endpoint": "/api/v1/tao_dividends",
@@ -58,24 +172,26 @@ async def tao_dividends(
     try:
         # Persist request details asynchronously to MongoDB
         persisted_request_id = await persist_request_data(request_log_data)
-        logger.info("Request details persisted successfully with ID: %s", persisted_request_id)
+        logger.debug("Request details persisted successfully with ID: %s", persisted_request_id)
 
         # Case 1: netuid is omitted, fetch all netuids and their hotkeys
         if netuid is None:
-            logger.info("No netuid specified. Retrieving dividends for all netuids and hotkeys.")
+            logger.debug("No netuid specified. Retrieving dividends for all netuids and hotkeys.")
 
-            all_dividends = await fetch_all_netuids()
+            all_dividends = await (await _staking_service()).fetch_all_netuids()
+            store_subnet_snapshots(redis_client, all_dividends, ttl=SNAPSHOT_TTL)
             return {"cached": False, "data": all_dividends}
 
         # Case 2: hotkey is omitted, fetch all hotkeys for the specified netuid
         if hotkey is None:
-            logger.info("No hotkey specified. Retrieving dividends for all hotkeys under netuid=%s.", netuid)
+            logger.debug("No hotkey specified. Retrieving dividends for all hotkeys under netuid=%s.", netuid)
 
-            dividends_for_netuid = await fetch_all_hotkeys_for_netuid(netuid)
+            dividends_for_netuid = await (await _staking_service()).fetch_all_hotkeys_for_netuid(netuid)
+            store_subnet_snapshots(redis_client, {netuid: dividends_for_netuid}, ttl=SNAPSHOT_TTL)
             return {"cached": False, "data": dividends_for_netuid}
 
         # Case 3: Both netuid and hotkey are specified
-        logger.info(
+        logger.debug(
             "Fetching dividends for netuid=%s and hotkey=%s.",
             netuid,
             hotkey
@@ -83,14 +199,14 @@ async def tao_dividends(
         cache_key = f"{netuid}:{hotkey}"
         cached_data = get_cached_data(redis_client, cache_key)
         if cached_data:
-            logger.info(
+            logger.debug(
                 "Cache hit for key: %s. Returning cached data with Cache status: True",
                 cache_key,
             )
             return {"cached": True, "data": cached_data}
 
         # Fetch dividends and store in cache
-        dividends = await fetch_tao_dividends(netuid, hotkey)
+        dividends = await (await _staking_service()).fetch_tao_dividends(netuid, hotkey)
         cache_ttl = int(os.environ.get("CACHE_TTL"))  # Default TTL if not set
         set_cache(redis_client, cache_key, dividends, ttl=cache_ttl)
 
@@ -100,11 +216,27 @@ async def tao_dividends(
                 "Trade flag is True. Triggering sentiment analysis task for netuid=%s, hotkey=%s.",
                 netuid, hotkey,
             )
-            task = celery_app.send_task("app.task.sentiment_based_staking_task.analyze_sentiment_and_execute",
-                                        args=(netuid, hotkey))
+            key = build_idempotency_key(netuid, hotkey, idempotency_key)
+            window = int(os.environ.get("TRADE_IDEMPOTENCY_WINDOW", 60))
+            with start_span("idempotency.reserve", key=key):
+                task_id, created = reserve_task_id(redis_client, key, window)
+            if not created:
+                logger.info("Trade already triggered within the idempotency window. Task ID: %s", task_id)
+                return {"cached": False, "data": dividends, "task_id": task_id, "duplicate": True}
+
+            try:
+                with start_span("celery.send_task", task_id=task_id):
+                    # Propagate the trace context so the worker's spans join this trace
+                    task = celery_app.send_task(
+                        "app.task.sentiment_based_staking_task.analyze_sentiment_and_execute",
+                        args=(netuid, hotkey), kwargs={"trace_context": inject()}, task_id=task_id
+                    )
+            except Exception:
+                release_task_id(redis_client, key, task_id)
+                raise
             logger.info("Sentiment analysis task successfully triggered. Task ID: %s", task.id)
 
-            return {"cached": False, "data": dividends, "task_id": task.id}
+            return {"cached": False, "data": dividends, "task_id": task.id, "duplicate": False}
 
         return {"cached": False, "data": dividends}
 
@@ -114,3 +246,144 @@ async def tao_dividends(
             exc_info=True
         )
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+
+@app.get("/health")
+async def health():
+    # Startup timings for this worker, used to track boot time when autoscaling
+    return {
+        "status": "ok",
+        "startup": app.state.startup_report,
+        "staking_service_loaded": _staking_module is not None,
+    }
+
+
+@app.get("/api/v1/subnets/{netuid}/stats")
+async def subnet_stats(
+        netuid: int,
+        token: HTTPAuthorizationCredentials = Depends(security),
+):
+    _authorize(token)
+
+    try:
+        stats, cached = await _subnet_stats(netuid)
+        return {"cached": cached, "netuid": netuid, "data": stats}
+
+    except Exception as e:
+        logger.error(
+            "An error occurred while fetching stats for netuid=%s: %s", netuid, str(e),
+            exc_info=True
+        )
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+
+@app.get("/api/v1/subnets/{netuid}/top")
+async def subnet_top(
+        netuid: int,
+        n: int = Query(default=10, ge=1, le=1000),
+        token: HTTPAuthorizationCredentials = Depends(security),
+):
+    _authorize(token)
+
+    try:
+        stats, cached = await _subnet_stats(netuid)
+        return {
+            "cached": cached,
+            "netuid": netuid,
+            "total": stats["total"],
+            "count": stats["count"],
+            "data": get_top_hotkeys(redis_client, netuid, n),
+        }
+
+    except Exception as e:
+        logger.error(
+            "An error occurred while fetching top hotkeys for netuid=%s: %s", netuid, str(e),
+            exc_info=True
+        )
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+
+@app.get("/api/v1/subnets/{netuid}/rank")
+async def subnet_rank(
+        netuid: int,
+        hotkey: str,
+        token: HTTPAuthorizationCredentials = Depends(security),
+):
+    _authorize(token)
+
+    try:
+        stats, cached = await _subnet_stats(netuid)
+        ranked = get_hotkey_rank(redis_client, netuid, hotkey)
+    except Exception as e:
+        logger.error(
+            "An error occurred while ranking hotkey=%s on netuid=%s: %s", hotkey, netuid, str(e),
+            exc_info=True
+        )
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+    if ranked is None:
+        raise HTTPException(status_code=404, detail="Hotkey not found for netuid")
+    rank, dividend = ranked
+    return {
+        "cached": cached,
+        "netuid": netuid,
+        "data": {"hotkey": hotkey, "rank": rank, "count": stats["count"], "dividend": dividend},
+    }
+
+
+@app.get("/api/v1/subnets/{netuid}/share")
+async def subnet_share(
+        netuid: int,
+        hotkey: str,
+        token: HTTPAuthorizationCredentials = Depends(security),
+):
+    _authorize(token)
+
+    try:
+        stats, cached = await _subnet_stats(netuid)
+        ranked = get_hotkey_rank(redis_client, netuid, hotkey)
+    except Exception as e:
+        logger.error(
+            "An error occurred while computing share of hotkey=%s on netuid=%s: %s", hotkey, netuid, str(e),
+            exc_info=True
+        )
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+    if ranked is None:
+        raise HTTPException(status_code=404, detail="Hotkey not found for netuid")
+    _, dividend = ranked
+    return {
+        "cached": cached,
+        "netuid": netuid,
+        "data": {
+            "hotkey": hotkey,
+            "dividend": dividend,
+            "total": stats["total"],
+            "share": dividend / stats["total"] if stats["total"] else 0.0,
+        },
+    }
+
+
+@app.get("/api/v1/tasks/{task_id}")
+async def task_status(
+        task_id: str,
+        token: HTTPAuthorizationCredentials = Depends(security),
+):
+    _authorize(token)
+
+    try:
+        # Read the task state from the Celery result backend
+        result = celery_app.AsyncResult(task_id)
+        response = {"task_id": task_id, "status": result.status}
+        if result.successful():
+            response["result"] = result.result
+        elif result.failed():
+            response["error"] = str(result.result)
+        return response
+
+    except Exception as e:
+        logger.error(
+            "An error occurred while fetching status for task %s: %s", task_id, str(e),
+            exc_info=True
+        )
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
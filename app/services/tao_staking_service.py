@@ -10,6 +10,8 @@ from bittensor.utils.balance import check_and_convert_to_balance
 from bittensor_wallet import Wallet
 from bittensor_wallet.utils import SS58_FORMAT
 from dotenv import load_dotenv
+from app.util.tracing_utilities import start_span
+from app.util.logging_utilities import get_sampled_logger
 from typing import Dict, List, Tuple, Optional
 
 import os
@@ -17,12 +19,9 @@ import os
 # Load environment variables from the .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,  # Set log level to INFO (change to DEBUG for more detailed logs)
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
+# High-volume per-entry messages from query_map iteration are sampled
+entry_logger = get_sampled_logger(f"{__name__}.entries")
 
 OPENTENSOR_URL = os.environ.get("OPENTENSOR_URL")
 
@@ -35,7 +34,7 @@ async def fetch_tao_dividends(netuid: int, hotkey: str):
     :param hotkey: The hotkey to filter results.
     :return: A tuple containing the decoded hotkey, its dividend value, and block hash, or None if no result is found.
     """
-    logger.info(f"Starting fetch_tao_dividends for netuid: {netuid}, hotkey: {hotkey}")
+    logger.info("Starting fetch_tao_dividends for netuid: %s, hotkey: %s", netuid, hotkey)
 
     async def collect_results(query_map_result):
         """
@@ -45,11 +44,13 @@ async def fetch_tao_dividends(netuid: int, hotkey: str):
         """
         results = []
         try:
-            async for k, v in await query_map_result:
-                logger.debug(f"Retrieved raw result - Key: {k}, Value: {v}")
-                results.append((k, v))
+            with start_span("substrate.query_map", netuid=netuid) as span:
+                async for k, v in await query_map_result:
+                    entry_logger.debug("Retrieved raw result - Key: %s, Value: %s", k, v)
+                    results.append((k, v))
+                span.set_attribute("entries", len(results))
         except Exception as e:
-            logger.error(f"Error occurred while collecting query results: {e}")
+            logger.error("Error occurred while collecting query results: %s", e)
             raise
         return results
 
@@ -58,14 +59,15 @@ async def fetch_tao_dividends(netuid: int, hotkey: str):
                 url="wss://entrypoint-finney.opentensor.ai:443",
                 ss58_format=SS58_FORMAT
         ) as substrate:
-            logger.info(f"Connected to Substrate node at wss://entrypoint-finney.opentensor.ai:443")
+            logger.info("Connected to Substrate node at wss://entrypoint-finney.opentensor.ai:443")
 
             # Get the latest block hash
-            block_hash = await substrate.get_chain_head()
-            logger.debug(f"Fetched latest block hash: {block_hash}")
+            with start_span("substrate.get_chain_head"):
+                block_hash = await substrate.get_chain_head()
+            logger.debug("Fetched latest block hash: %s", block_hash)
 
             # Query the TaoDividendsPerSubnet map for the given netuid
-            logger.debug(f"Querying SubtensorModule.TaoDividendsPerSubnet for netuid: {netuid}")
+            logger.debug("Querying SubtensorModule.TaoDividendsPerSubnet for netuid: %s", netuid)
             query_map_result = substrate.query_map(
                 "SubtensorModule",
                 "TaoDividendsPerSubnet",
@@ -74,27 +76,28 @@ async def fetch_tao_dividends(netuid: int, hotkey: str):
             )
 
             # Collect and decode results
-            logger.debug(f"Collecting results from query_map generator...")
+            logger.debug("Collecting results from query_map generator...")
             all_results = await collect_results(query_map_result)
 
-            logger.info(f"Collected {len(all_results)} results from query_map for netuid: {netuid}")
+            logger.info("Collected %s results from query_map for netuid: %s", len(all_results), netuid)
 
             # Filter results based on the provided hotkey
-            filtered_results = [
-                (decode_account_id(k), v.value) for k, v in all_results if decode_account_id(k) == hotkey
-            ]
-            logger.debug(f"Filtered results for hotkey '{hotkey}': {filtered_results}")
+            with start_span("substrate.decode", entries=len(all_results)):
+                filtered_results = [
+                    (decode_account_id(k), v.value) for k, v in all_results if decode_account_id(k) == hotkey
+                ]
+            logger.debug("Filtered results for hotkey '%s': %s", hotkey, filtered_results)
 
             # Return the first match or None if not found
             if filtered_results:
-                logger.info(f"Found matching dividend for hotkey '{hotkey}': {filtered_results[0]}")
+                logger.info("Found matching dividend for hotkey '%s': %s", hotkey, filtered_results[0])
                 return filtered_results[0], block_hash
             else:
-                logger.warning(f"No matching dividend found for hotkey '{hotkey}'. Returning None.")
+                logger.warning("No matching dividend found for hotkey '%s'. Returning None.", hotkey)
                 return None, block_hash
 
     except Exception as e:
-        logger.error(f"An error occurred in fetch_tao_dividends: {e}")
+        logger.error("An error occurred in fetch_tao_dividends: %s", e)
         raise
 
 
@@ -115,43 +118,53 @@ async def fetch_all_netuids() -> Dict[int, List[Tuple[str, int]]]:
         logger.info("Successfully connected to the Substrate node.")
 
         # Get latest block hash
-        block_hash = await substrate.get_chain_head()
-        logger.debug(f"Retrieved block hash: {block_hash}")
+        with start_span("substrate.get_chain_head"):
+            block_hash = await substrate.get_chain_head()
+        logger.debug("Retrieved block hash: %s", block_hash)
 
         # Query TaoDividendsPerSubnet from the Substrate node at latest block
-        query = await substrate.query_map(
-            module='SubtensorModule',
-            storage_function='TaoDividendsPerSubnet',
-            params=[],
-            block_hash=block_hash
-        )
+        with start_span("substrate.query_map", netuid="all") as span:
+            entries = 0
+            query = await substrate.query_map(
+                module='SubtensorModule',
+                storage_function='TaoDividendsPerSubnet',
+                params=[],
+                block_hash=block_hash
+            )
 
-        async for raw_key, raw_value in query:
-            # Robustly decode the raw key into bytes
-            key_bytes = decode_raw_key(raw_key)
-            if key_bytes is None:
-                logger.warning(f"Skipping unsupported key structure: {raw_key}")
-                continue
-
-            # Decode account id from bytes
-            try:
-                account_id = substrate.ss58_encode(key_bytes)
-                logger.debug(f"Decoded account ID: {account_id}")
-            except Exception as e:
-                logger.error(f"Failed to convert key bytes to account ID: {e}. Raw key: {raw_key}")
-                continue
-
-            # Safely extract netuid and dividend values from the raw value
-            netuid, dividend = extract_netuid_and_dividend(raw_value)
-            if netuid is None or dividend <= 0:
-                logger.warning(f"Invalid or zero dividend data received: {raw_value}")
-                continue
-
-            # Add data to the results dictionary
-            results.setdefault(netuid, []).append((account_id, dividend))
-            logger.debug(f"Recorded netuid: {netuid}, account: {account_id}, dividend: {dividend}")
-
-    logger.info(f"Completed fetching Tao dividends. Netuids processed: {len(results)}")
+            async for raw_key, raw_value in query:
+                entries += 1
+                # Robustly decode the raw key into bytes
+                key_bytes = decode_raw_key(raw_key)
+                if key_bytes is None:
+                    entry_logger.warning("Skipping unsupported key structure: %s", raw_key)
+                    continue
+
+                # Decode account id from bytes
+                try:
+                    account_id = substrate.ss58_encode(key_bytes)
+                    entry_logger.debug("Decoded account ID: %s", account_id)
+                except Exception as e:
+                    entry_logger.error("Failed to convert key bytes to account ID: %s. Raw key: %s", e, raw_key)
+                    continue
+
+                # Safely extract netuid and dividend values from the raw value
+                netuid, dividend = extract_netuid_and_dividend(raw_value)
+                if netuid is None:
+                    entry_logger.warning("Invalid dividend data received: %s", raw_value)
+                    continue
+                if dividend <= 0:
+                    # Zero dividends are normal data, so they are only logged (sampled) at DEBUG
+                    entry_logger.debug("Skipping zero dividend for netuid: %s, account: %s", netuid, account_id)
+                    continue
+
+                # Add data to the results dictionary
+                results.setdefault(netuid, []).append((account_id, dividend))
+                entry_logger.debug("Recorded netuid: %s, account: %s, dividend: %s", netuid, account_id, dividend)
+
+            span.set_attribute("entries", entries)
+
+    logger.info("Completed fetching Tao dividends. Netuids processed: %s", len(results))
     return results
 
 
@@ -180,9 +193,9 @@ def decode_raw_key(raw_key) -> Optional[bytes]:
                     return bytes(innermost)
 
     except Exception as e:
-        logger.error(f"Exception decoding raw key {raw_key}: {e}")
+        entry_logger.error("Exception decoding raw key %s: %s", raw_key, e)
 
-    logger.warning(f"Unrecognized key structure: {raw_key}")
+    entry_logger.warning("Unrecognized key structure: %s", raw_key)
     return None
 
 
@@ -202,7 +215,7 @@ def extract_netuid_and_dividend(value) -> Tuple[Optional[int], int]:
 
         return netuid, dividend
     except Exception as e:
-        logger.error(f"Failed to extract netuid and dividend from value {value}: {e}")
+        entry_logger.error("Failed to extract netuid and dividend from value %s: %s", value, e)
         return None, 0
 
 
@@ -218,7 +231,8 @@ async def fetch_all_hotkeys_for_netuid(netuid: int):
             ss58_format=SS58_FORMAT,
     ) as substrate:
         # Get the latest block hash
-        block_hash = await substrate.get_chain_head()
+        with start_span("substrate.get_chain_head"):
+            block_hash = await substrate.get_chain_head()
 
         # Query TaoDividendsPerSubnet for a single netuid
         query_map_result = substrate.query_map(
@@ -229,9 +243,11 @@ async def fetch_all_hotkeys_for_netuid(netuid: int):
         )
 
         # Collect results
-        async for k, v in await query_map_result:
-            decoded_key = decode_account_id(k)
-            results.append((decoded_key, v.value))
+        with start_span("substrate.query_map", netuid=netuid) as span:
+            async for k, v in await query_map_result:
+                decoded_key = decode_account_id(k)
+                results.append((decoded_key, v.value))
+            span.set_attribute("entries", len(results))
 
     return results
 
@@ -239,7 +255,7 @@ async def fetch_all_hotkeys_for_netuid(netuid: int):
 # Function to stake Tao
 def stake_tao(hotkey: str, netuid: int, amount: float):
     """Async function to stake Tao for a specific hotkey and netuid."""
-    logger.info(f"Staking Tao: {amount} for hotkey: {hotkey} on netuid: {netuid}")
+    logger.info("Staking Tao: %s for hotkey: %s on netuid: %s", amount, hotkey, netuid)
     try:
         # Validate and convert the amount to balance
         amount = check_and_convert_to_balance(amount)
@@ -247,7 +263,7 @@ def stake_tao(hotkey: str, netuid: int, amount: float):
         wallet = Wallet(name="default", path="~/.bittensor/wallets")
         wallet.create_new_coldkey(overwrite=True, use_password=False)
 
-        print(f"Coldkey for wallet '{wallet.name}' has been regenerated.")
+        logger.info("Coldkey for wallet '%s' has been regenerated.", wallet.name)
 
         # Initialize Subtensor with the correct WebSocket endpoint
         subtensor = Subtensor(network="wss://entrypoint-finney.opentensor.ai:443")
@@ -262,17 +278,17 @@ def stake_tao(hotkey: str, netuid: int, amount: float):
             safe_staking=False,
             allow_partial_stake=False,
         )
-        logger.info(f"Successfully staked Tao: {amount} for hotkey: {hotkey} on netuid: {netuid}")
+        logger.info("Successfully staked Tao: %s for hotkey: %s on netuid: %s", amount, hotkey, netuid)
         return result
     except Exception as e:
-        logger.error(f"Error staking Tao: {amount} for hotkey: {hotkey} on netuid: {netuid}. Error: {e}")
+        logger.error("Error staking Tao: %s for hotkey: %s on netuid: %s. Error: %s", amount, hotkey, netuid, e)
         raise
 
 
 # Function to unstake Tao
 def unstake_tao(hotkey: str, netuid: int, amount: float):
     """Async function to unstake Tao for a specific hotkey and netuid."""
-    logger.info(f"Unstaking Tao: {amount} for hotkey: {hotkey} on netuid: {netuid}")
+    logger.info("Unstaking Tao: %s for hotkey: %s on netuid: %s", amount, hotkey, netuid)
     try:
         # Validate and convert the amount to balance
         amount = check_and_convert_to_balance(amount)
@@ -280,7 +296,7 @@ def unstake_tao(hotkey: str, netuid: int, amount: float):
         wallet = Wallet(name="default", path="~/.bittensor/wallets")
         wallet.create_new_coldkey(overwrite=True, use_password=False)
 
-        print(f"Coldkey for wallet '{wallet.name}' has been regenerated.")
+        logger.info("Coldkey for wallet '%s' has been regenerated.", wallet.name)
 
         # Initialize Subtensor with the correct WebSocket endpoint
         subtensor = Subtensor(network="wss://entrypoint-finney.opentensor.ai:443")
@@ -295,8 +311,8 @@ def unstake_tao(hotkey: str, netuid: int, amount: float):
             safe_staking=False,
             allow_partial_stake=False,
         )
-        logger.info(f"Successfully unstaked Tao: {amount} for hotkey: {hotkey} on netuid: {netuid}")
+        logger.info("Successfully unstaked Tao: %s for hotkey: %s on netuid: %s", amount, hotkey, netuid)
         return result
     except Exception as e:
-        logger.error(f"Error unstaking Tao: {amount} for hotkey: {hotkey} on netuid: {netuid}. Error: {e}")
+        logger.error("Error unstaking Tao: %s for hotkey: %s on netuid: %s. Error: %s", amount, hotkey, netuid, e)
         raise
@@ -0,0 +1,31 @@
+import os
+from celery import Celery
+from celery.signals import setup_logging
+
+from app.util.logging_utilities import configure_logging
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Get Redis host and port from environment variables
+redis_host = os.environ.get("REDIS_HOST")
+redis_port = os.environ.get("REDIS_PORT")
+
+# Build the broker and backend URLs dynamically
+broker_url = f"redis://{redis_host}:{redis_port}/0"
+backend_url = f"redis://{redis_host}:{redis_port}/0"
+
+# Initialize Celery app. Kept free of task/service imports so the API process can
+# enqueue tasks by name and read results without loading the chain/staking stack.
+celery_app = Celery(
+    "tasks",
+    broker=broker_url,
+    backend=backend_url
+)
+
+
+@setup_logging.connect
+def configure_worker_logging(**kwargs):
+    # Use the central logging configuration instead of Celery's root logger setup
+    configure_logging()
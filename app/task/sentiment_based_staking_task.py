@@ -1,8 +1,8 @@
-import os
-from celery import Celery
+from app.task.celery_app import celery_app
 from app.services.tao_staking_service import stake_tao, unstake_tao
 from app.services.sentiment_analysis_service import analyze_sentiment
 from app.db.mongo_persistence import persist_sentiment_data  # Import persistence layer
+from app.util.tracing_utilities import start_span, extract
 import asyncio
 
 from dotenv import load_dotenv
@@ -10,53 +10,45 @@ import logging
 
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
-# Get Redis host and port from environment variables
-redis_host = os.environ.get("REDIS_HOST")
-redis_port = os.environ.get("REDIS_PORT")
 
-# Build the broker and backend URLs dynamically
-broker_url = f"redis://{redis_host}:{redis_port}/0"
-backend_url = f"redis://{redis_host}:{redis_port}/0"
-
-# Initialize Celery app
-celery_app = Celery(
-    "tasks",
-    broker=broker_url,
-    backend=backend_url
-)
+@celery_app.task
+def analyze_sentiment_and_execute(netuid: int, hotkey: str, trace_context: dict | None = None):
+    # Continue the API request's trace (W3C traceparent passed in trace_context)
+    with extract(trace_context):
+        with start_span("analyze_sentiment_and_execute", netuid=netuid, hotkey=hotkey):
+            return _analyze_sentiment_and_execute(netuid, hotkey)
 
 
-@celery_app.task
-def analyze_sentiment_and_execute(netuid: int, hotkey: str):
-    logger.info(f"Task started: Analyzing sentiment and executing actions for hotkey={hotkey}, netuid={netuid}")
+def _analyze_sentiment_and_execute(netuid: int, hotkey: str):
+    logger.info("Task started: Analyzing sentiment and executing actions for hotkey=%s, netuid=%s", hotkey, netuid)
 
     try:
         # Analyze sentiment
-        sentiment_score = analyze_sentiment(netuid)
-        logger.info(f"Sentiment analysis completed: netuid={netuid}, sentiment_score={sentiment_score}")
+        with start_span("sentiment.analyze", netuid=netuid):
+            sentiment_score = analyze_sentiment(netuid)
+        logger.info("Sentiment analysis completed: netuid=%s, sentiment_score=%s", netuid, sentiment_score)
 
         # Determine stake amount
         stake_amount = 0.01 * abs(sentiment_score)
-        logger.info(f"Calculated stake amount: {stake_amount}")
+        logger.info("Calculated stake amount: %s", stake_amount)
 
         # Execute staking or unstaking based on sentiment
         if sentiment_score > 0:
-            logger.info(f"Positive sentiment detected. Staking {stake_amount} for hotkey={hotkey} on netuid={netuid}")
-            result = stake_tao(hotkey, netuid, stake_amount)
+            logger.info("Positive sentiment detected. Staking %s for hotkey=%s on netuid=%s",
+                        stake_amount, hotkey, netuid)
+            with start_span("staking.stake", amount=stake_amount):
+                result = stake_tao(hotkey, netuid, stake_amount)
             operation = "stake"
         else:
-            logger.info(f"Negative sentiment detected. Unstaking {stake_amount} for hotkey={hotkey} on netuid={netuid}")
-            result = unstake_tao(hotkey, netuid, stake_amount)
+            logger.info("Negative sentiment detected. Unstaking %s for hotkey=%s on netuid=%s",
+                        stake_amount, hotkey, netuid)
+            with start_span("staking.unstake", amount=stake_amount):
+                result = unstake_tao(hotkey, netuid, stake_amount)
             operation = "unstake"
 
-        logger.info(f"Task completed successfully for hotkey={hotkey}, netuid={netuid}. Response: {result}")
+        logger.info("Task completed successfully for hotkey=%s, netuid=%s. Response: %s", hotkey, netuid, result)
 
         # Async MongoDB persistence
         persisted_data = {
@@ -70,10 +62,11 @@ def analyze_sentiment_and_execute(netuid: int, hotkey: str):
 
         # Ensure event loop integration for asynchronous operation
         asyncio.run(persist_sentiment_data(persisted_data))
-        logger.info(f"Persisted result to MongoDB for hotkey={hotkey}, netuid={netuid}")
+        logger.info("Persisted result to MongoDB for hotkey=%s, netuid=%s", hotkey, netuid)
 
         return result
 
     except Exception as e:
-        logger.error(f"An error occurred while processing hotkey={hotkey}, netuid={netuid}. Error: {e}", exc_info=True)
+        logger.error("An error occurred while processing hotkey=%s, netuid=%s. Error: %s", hotkey, netuid, e,
+                     exc_info=True)
         raise
@@ -0,0 +1,39 @@
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from ..main import app
+
+AUTH_TOKEN = "test_token"
+HEADERS = {"Authorization": f"Bearer {AUTH_TOKEN}"}
+INVALID_HEADERS = {"Authorization": "Bearer invalid_token"}
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def staking_service():
+    """
+    Fake chain/staking service. Override this fixture in a test module to return other data.
+    """
+    service = MagicMock()
+    service.fetch_tao_dividends = AsyncMock(return_value=[["hk", 10], "0xblock"])
+    return service
+
+
+@pytest.fixture
+def client(redis_client, staking_service):
+    """
+    Test client with Redis, MongoDB and the staking service replaced by fakes.
+    """
+    with patch.dict(os.environ, {"AUTH_TOKEN": AUTH_TOKEN, "CACHE_TTL": "120"}), \
+            patch("app.main.redis_client", redis_client), \
+            patch("app.main.persist_request_data", AsyncMock(return_value="request-id")), \
+            patch("app.main._staking_service", AsyncMock(return_value=staking_service)):
+        yield TestClient(app)
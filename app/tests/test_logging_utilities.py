@@ -0,0 +1,54 @@
+import json
+import logging
+import os
+import queue
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from ..util import logging_utilities
+from ..util.logging_utilities import JsonFormatter, SamplingFilter, _TracebackQueueHandler, configure_logging
+
+
+def _record(level: int, msg: str = "entry %s", args=(1,), exc_info=None) -> logging.LogRecord:
+    return logging.LogRecord("app.test", level, __file__, 1, msg, args, exc_info)
+
+
+def test_sampling_filter_samples_debug_and_info_only():
+    sampling_filter = SamplingFilter(every=100)
+
+    assert [sampling_filter.filter(_record(logging.DEBUG)) for _ in range(5)] == [True, False, False, False, False]
+    assert all(sampling_filter.filter(_record(logging.WARNING)) for _ in range(5))
+    assert all(sampling_filter.filter(_record(logging.ERROR)) for _ in range(5))
+
+
+def test_queue_handler_keeps_exc_info_for_json_formatter():
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        record = _record(logging.ERROR, "boom %s", (1,), sys.exc_info())
+
+    prepared = _TracebackQueueHandler(queue.SimpleQueue()).prepare(record)
+    entry = json.loads(JsonFormatter().format(prepared))
+
+    assert entry["message"] == "boom 1"
+    assert "ZeroDivisionError" in entry["exc_info"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_logs_are_written(tmp_path):
+    configure_logging()
+    log_path = tmp_path / "worker.log"
+
+    with open(log_path, "w") as log_file, \
+            patch.object(logging_utilities._stream_handler, "stream", log_file):
+        pid = os.fork()
+        if pid == 0:
+            # Simulates a Celery prefork pool child writing a task log line
+            logging.getLogger("app.test").warning("from child")
+            logging_utilities._stop_listener()
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+    assert "from child" in log_path.read_text()
@@ -0,0 +1,61 @@
+import logging
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ..main import app
+
+
+@pytest.fixture
+def lifespan_patches():
+    """
+    Patch the clients created in the lifespan hook and reset the cached staking service.
+    """
+    with patch.dict(os.environ, {"REDIS_HOST": "localhost", "REDIS_PORT": "6379"}), \
+            patch("app.main.Redis") as redis, \
+            patch("app.main.init_mongo"), \
+            patch("app.main.close_mongo") as close_mongo, \
+            patch("app.main._staking_module", None):
+        yield redis, close_mongo
+
+
+def _wait_until(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_preload_failure_is_logged(lifespan_patches, caplog):
+    redis, close_mongo = lifespan_patches
+
+    with patch("app.main.importlib.import_module", side_effect=ImportError("no bittensor")), \
+            caplog.at_level(logging.ERROR, logger="app.main"):
+        with TestClient(app):
+            assert _wait_until(lambda: app.state.staking_service_preload.done())
+
+    failures = [record for record in caplog.records if record.getMessage().startswith("Failed to preload")]
+    assert len(failures) == 1
+    assert isinstance(failures[0].exc_info[1], ImportError)
+    redis.return_value.close.assert_called_once()
+    close_mongo.assert_called_once()
+
+
+def test_unfinished_preload_is_cancelled_on_shutdown(lifespan_patches):
+    redis, close_mongo = lifespan_patches
+
+    def slow_import(name):
+        # Still importing when the worker shuts down
+        time.sleep(0.5)
+        return MagicMock()
+
+    with patch("app.main.importlib.import_module", side_effect=slow_import):
+        with TestClient(app):
+            pass
+
+    assert app.state.staking_service_preload.cancelled()
+    redis.return_value.close.assert_called_once()
+    close_mongo.assert_called_once()
@@ -0,0 +1,114 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from .conftest import HEADERS, INVALID_HEADERS
+from ..util.subnet_index_utilities import (
+    compute_subnet_stats, store_subnet_snapshots, get_subnet_stats, get_top_hotkeys, get_hotkey_rank
+)
+
+LARGE_DIVIDEND = 2 ** 53 + 1  # Not representable as a double
+SUBNET = [("hk-a", 30), ("hk-b", 10), ("hk-c", 20), ("hk-zero", 0), ("hk-large", LARGE_DIVIDEND)]
+
+
+@pytest.fixture
+def staking_service():
+    service = MagicMock()
+    service.fetch_all_hotkeys_for_netuid = AsyncMock(return_value=SUBNET)
+    service.fetch_all_netuids = AsyncMock(return_value={1: [entry for entry in SUBNET if entry[1] > 0]})
+    return service
+
+
+def test_compute_subnet_stats():
+    assert compute_subnet_stats([]) == {"total": 0, "count": 0, "p50": 0, "p90": 0, "p99": 0}
+    assert compute_subnet_stats([3, 1, 2]) == {"total": 6, "count": 3, "p50": 2, "p90": 3, "p99": 3}
+    assert compute_subnet_stats(list(range(1, 101))) == {"total": 5050, "count": 100, "p50": 50, "p90": 90, "p99": 99}
+
+
+def test_store_subnet_snapshots_skips_zero_dividends(redis_client):
+    stats = store_subnet_snapshots(redis_client, {1: SUBNET}, ttl=60)
+
+    expected = compute_subnet_stats([30, 10, 20, LARGE_DIVIDEND])
+    assert stats == {1: expected}
+    assert get_subnet_stats(redis_client, 1) == expected
+    assert get_hotkey_rank(redis_client, 1, "hk-zero") is None
+    assert 0 < redis_client.ttl("subnet:1:dividends") <= 60
+
+
+def test_store_subnet_snapshots_replaces_previous_snapshot(redis_client):
+    store_subnet_snapshots(redis_client, {1: SUBNET}, ttl=60)
+    store_subnet_snapshots(redis_client, {1: [("hk-b", 5)]}, ttl=60)
+
+    assert get_top_hotkeys(redis_client, 1, 10) == [{"hotkey": "hk-b", "dividend": 5}]
+    assert get_subnet_stats(redis_client, 1)["count"] == 1
+
+
+def test_top_and_rank_return_exact_dividends(redis_client):
+    store_subnet_snapshots(redis_client, {1: SUBNET}, ttl=60)
+
+    assert get_top_hotkeys(redis_client, 1, 2) == [
+        {"hotkey": "hk-large", "dividend": LARGE_DIVIDEND},
+        {"hotkey": "hk-a", "dividend": 30},
+    ]
+    assert get_hotkey_rank(redis_client, 1, "hk-large") == (1, LARGE_DIVIDEND)
+    assert get_hotkey_rank(redis_client, 1, "hk-b") == (4, 10)
+    assert get_hotkey_rank(redis_client, 1, "unknown") is None
+    assert get_subnet_stats(redis_client, 2) is None
+
+
+def test_snapshot_is_the_same_whichever_endpoint_refreshed_it(client, redis_client):
+    client.get("/api/v1/tao_dividends", params={"netuid": 1}, headers=HEADERS)
+    from_netuid = get_subnet_stats(redis_client, 1)
+    redis_client.flushall()
+    client.get("/api/v1/tao_dividends", headers=HEADERS)
+
+    assert get_subnet_stats(redis_client, 1) == from_netuid
+
+
+def test_stats_endpoint_refreshes_missing_snapshot(client, staking_service):
+    first = client.get("/api/v1/subnets/1/stats", headers=HEADERS).json()
+    second = client.get("/api/v1/subnets/1/stats", headers=HEADERS).json()
+
+    assert first == {"cached": False, "netuid": 1, "data": compute_subnet_stats([30, 10, 20, LARGE_DIVIDEND])}
+    assert second["cached"] is True
+    assert second["data"] == first["data"]
+    staking_service.fetch_all_hotkeys_for_netuid.assert_awaited_once_with(1)
+
+
+def test_top_endpoint(client):
+    response = client.get("/api/v1/subnets/1/top", params={"n": 2}, headers=HEADERS).json()
+
+    assert response["count"] == 4
+    assert response["total"] == 60 + LARGE_DIVIDEND
+    assert [entry["hotkey"] for entry in response["data"]] == ["hk-large", "hk-a"]
+
+
+def test_rank_endpoint(client):
+    response = client.get("/api/v1/subnets/1/rank", params={"hotkey": "hk-c"}, headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"hotkey": "hk-c", "rank": 3, "count": 4, "dividend": 20}
+
+
+def test_share_endpoint(client):
+    response = client.get("/api/v1/subnets/1/share", params={"hotkey": "hk-a"}, headers=HEADERS)
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["dividend"] == 30
+    assert data["total"] == 60 + LARGE_DIVIDEND
+    assert data["share"] == pytest.approx(30 / (60 + LARGE_DIVIDEND))
+
+
+@pytest.mark.parametrize("endpoint", ["rank", "share"])
+def test_unknown_hotkey_returns_404(client, endpoint):
+    response = client.get(f"/api/v1/subnets/1/{endpoint}", params={"hotkey": "unknown"}, headers=HEADERS)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("endpoint", ["stats", "top", "rank?hotkey=hk-a", "share?hotkey=hk-a"])
+def test_subnet_endpoints_reject_invalid_token(client, endpoint):
+    response = client.get(f"/api/v1/subnets/1/{endpoint}", headers=INVALID_HEADERS)
+
+    assert response.status_code == 401
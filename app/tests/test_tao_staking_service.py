@@ -0,0 +1,45 @@
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from ..services import tao_staking_service  # noqa: E402
+
+
+class _FakeQueryMap:
+    def __init__(self, entries):
+        self._entries = iter(entries)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._entries)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_netuids_does_not_warn_on_zero_dividends(caplog):
+    entries = [
+        (bytes([i % 256]) * 32, SimpleNamespace(key=1, value=0 if i % 10 else 5))
+        for i in range(1000)
+    ]
+    substrate = MagicMock()
+    substrate.get_chain_head = AsyncMock(return_value="0xblock")
+    substrate.query_map = AsyncMock(return_value=_FakeQueryMap(entries))
+    substrate.ss58_encode = lambda key_bytes: key_bytes.hex()
+    substrate_interface = MagicMock()
+    substrate_interface.return_value.__aenter__ = AsyncMock(return_value=substrate)
+    substrate_interface.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    with patch.object(tao_staking_service, "AsyncSubstrateInterface", substrate_interface), \
+            caplog.at_level(logging.DEBUG, logger="app.services.tao_staking_service"):
+        results = await tao_staking_service.fetch_all_netuids()
+
+    assert len(results[1]) == 100
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
@@ -0,0 +1,125 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+from .conftest import HEADERS
+from ..util.tracing_utilities import Span, _FileSpanExporter, current_trace_id, extract, inject, start_span
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_SPAN_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01"
+
+
+def test_span_is_child_of_active_span():
+    with start_span("parent") as parent:
+        with start_span("child") as child:
+            assert child.trace_id == parent.trace_id
+            assert child.parent_id == parent.span_id
+    assert parent.parent_id is None
+    assert current_trace_id() is None
+
+
+def test_inject_outside_of_trace_is_empty():
+    assert inject() == {}
+
+
+def test_inject_extract_round_trip():
+    with start_span("caller") as caller:
+        carrier = inject()
+
+    assert carrier == {"traceparent": f"00-{caller.trace_id}-{caller.span_id}-01"}
+    with extract(carrier):
+        with start_span("callee") as callee:
+            assert callee.trace_id == caller.trace_id
+            assert callee.parent_id == caller.span_id
+    assert current_trace_id() is None
+
+
+def test_extract_invalid_carrier_starts_new_trace():
+    with extract({"traceparent": "not-a-traceparent"}):
+        with start_span("callee") as callee:
+            assert callee.parent_id is None
+            assert callee.trace_id != TRACE_ID
+
+
+def test_span_records_error_status():
+    try:
+        with start_span("failing") as span:
+            raise ValueError("boom")
+    except ValueError:
+        pass
+
+    assert span.status == "ERROR"
+    assert span.attributes["error"] == "boom"
+    assert span.duration_ms is not None
+
+
+def _span(name: str) -> Span:
+    span = Span(name, TRACE_ID, None, {})
+    span.end()
+    return span
+
+
+class _BlockingFile:
+    """
+    Wraps the exporter's file so the writer thread blocks inside its first write.
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def writelines(self, lines):
+        self.writing.set()
+        self.release.wait(timeout=5)
+        self._file.writelines(lines)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def test_file_exporter_writes_spans(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = _FileSpanExporter(str(path))
+    for name in ("a", "b"):
+        exporter.export(_span(name))
+    exporter.shutdown()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["name"] for record in records] == ["a", "b"]
+
+
+def test_file_exporter_drops_spans_beyond_queue_size(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = _FileSpanExporter(str(path), max_queue_size=2)
+    blocking_file = _BlockingFile(exporter._file)
+    exporter._file = blocking_file
+
+    exporter.export(_span("in-flight"))
+    assert blocking_file.writing.wait(timeout=5)
+    for name in ("queued-1", "queued-2", "dropped"):
+        exporter.export(_span(name))
+
+    assert exporter.dropped == 1
+    blocking_file.release.set()
+    exporter.shutdown()
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["name"] for record in records] == ["in-flight", "queued-1", "queued-2"]
+
+
+def test_trade_task_receives_request_trace_context(client):
+    send_task = MagicMock(side_effect=lambda *args, **kwargs: MagicMock(id=kwargs["task_id"]))
+
+    with patch("app.main.celery_app.send_task", send_task):
+        response = client.get(
+            "/api/v1/tao_dividends",
+            params={"netuid": 1, "hotkey": "hk", "trade": True},
+            headers={**HEADERS, "traceparent": TRACEPARENT},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["X-Trace-Id"] == TRACE_ID
+    traceparent = send_task.call_args.kwargs["kwargs"]["trace_context"]["traceparent"]
+    assert traceparent.startswith(f"00-{TRACE_ID}-")
+    assert PARENT_SPAN_ID not in traceparent  # The task's parent is the send_task span, not the caller
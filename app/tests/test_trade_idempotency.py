@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from .conftest import HEADERS, INVALID_HEADERS
+from ..util.idempotency_utilities import build_idempotency_key, reserve_task_id, release_task_id
+
+
+def test_reserve_task_id_first_reservation(redis_client):
+    key = build_idempotency_key(1, "hk")
+
+    task_id, created = reserve_task_id(redis_client, key, window=60)
+
+    assert created is True
+    assert redis_client.get(key).decode() == task_id
+    assert 0 < redis_client.ttl(key) <= 60
+
+
+def test_reserve_task_id_duplicate_within_window(redis_client):
+    key = build_idempotency_key(1, "hk")
+    first_task_id, _ = reserve_task_id(redis_client, key, window=60)
+
+    task_id, created = reserve_task_id(redis_client, key, window=60)
+
+    assert created is False
+    assert task_id == first_task_id
+
+
+def test_client_key_is_scoped_to_netuid_and_hotkey(redis_client):
+    first_task_id, _ = reserve_task_id(redis_client, build_idempotency_key(1, "hk", "abc"), window=60)
+
+    task_id, created = reserve_task_id(redis_client, build_idempotency_key(2, "other", "abc"), window=60)
+
+    assert created is True
+    assert task_id != first_task_id
+
+
+def test_release_task_id_only_releases_own_reservation(redis_client):
+    key = build_idempotency_key(1, "hk")
+    task_id, _ = reserve_task_id(redis_client, key, window=60)
+
+    release_task_id(redis_client, key, "another-task-id")
+    assert redis_client.get(key) is not None
+
+    release_task_id(redis_client, key, task_id)
+    assert redis_client.get(key) is None
+
+
+def test_trade_duplicate_returns_existing_task_id(client, redis_client):
+    params = {"netuid": 1, "hotkey": "hk", "trade": True}
+    with patch("app.main.celery_app.send_task", side_effect=lambda *args, **kwargs: MagicMock(id=kwargs["task_id"])) \
+            as send_task:
+        first = client.get("/api/v1/tao_dividends", params=params, headers=HEADERS).json()
+        redis_client.delete("1:hk")  # Drop the dividend cache so the trade path runs again
+        second = client.get("/api/v1/tao_dividends", params=params, headers=HEADERS).json()
+
+    assert first["duplicate"] is False
+    assert second["duplicate"] is True
+    assert second["task_id"] == first["task_id"]
+    send_task.assert_called_once()
+
+
+def test_trade_releases_reservation_when_send_task_fails(client, redis_client):
+    params = {"netuid": 1, "hotkey": "hk", "trade": True}
+    with patch("app.main.celery_app.send_task", side_effect=ConnectionError("broker down")):
+        response = client.get("/api/v1/tao_dividends", params=params, headers=HEADERS)
+
+    assert response.status_code == 500
+    assert redis_client.get(build_idempotency_key(1, "hk")) is None
+
+
+@pytest.mark.parametrize(
+    "status, successful, failed, result, expected",
+    [
+        ("SUCCESS", True, False, {"staked": 1}, {"result": {"staked": 1}}),
+        ("FAILURE", False, True, RuntimeError("stake failed"), {"error": "stake failed"}),
+        ("PENDING", False, False, None, {}),
+    ],
+)
+def test_task_status(client, status, successful, failed, result, expected):
+    async_result = MagicMock(status=status, result=result)
+    async_result.successful.return_value = successful
+    async_result.failed.return_value = failed
+
+    with patch("app.main.celery_app.AsyncResult", return_value=async_result):
+        response = client.get("/api/v1/tasks/task-1", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json() == {"task_id": "task-1", "status": status, **expected}
+
+
+def test_task_status_rejects_invalid_token(client):
+    response = client.get("/api/v1/tasks/task-1", headers=INVALID_HEADERS)
+
+    assert response.status_code == 401
@@ -0,0 +1,64 @@
+import logging
+import uuid
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)  # Use module-level logging
+
+IDEMPOTENCY_KEY_PREFIX = "idempotency:trade"
+
+
+def build_idempotency_key(netuid: int, hotkey: str, client_key: str | None = None) -> str:
+    """
+    Build the Redis key guarding a trade trigger. Triggers are deduplicated per netuid/hotkey
+    pair, or per client-supplied idempotency key scoped to that pair, so reusing a client key
+    for a different netuid/hotkey does not return another trade's task.
+    """
+    if client_key:
+        return f"{IDEMPOTENCY_KEY_PREFIX}:client:{client_key}:{netuid}:{hotkey}"
+    return f"{IDEMPOTENCY_KEY_PREFIX}:{netuid}:{hotkey}"
+
+
+def reserve_task_id(redis_client, key: str, window: int) -> tuple[str, bool]:
+    """
+    Atomically reserve a task ID for the given idempotency key (Redis SET NX EX).
+
+    :param redis_client: Redis client instance.
+    :param key: Idempotency key built by build_idempotency_key.
+    :param window: Deduplication window in seconds.
+    :return: Tuple (task_id, created). created is False when an existing task ID is returned.
+    """
+    task_id = str(uuid.uuid4())
+    if redis_client.set(key, task_id, nx=True, ex=window):
+        logger.debug("Reserved task ID %s for idempotency key: '%s' (window: %d seconds)", task_id, key, window)
+        return task_id, True
+
+    existing_task_id = redis_client.get(key)
+    if existing_task_id is None:
+        # The reservation expired between SET NX and GET; retry once with a fresh ID.
+        if redis_client.set(key, task_id, nx=True, ex=window):
+            return task_id, True
+        existing_task_id = redis_client.get(key)
+
+    if isinstance(existing_task_id, bytes):
+        existing_task_id = existing_task_id.decode()
+    logger.info("Duplicate trade trigger for idempotency key: '%s'. Existing task ID: %s", key, existing_task_id)
+    return existing_task_id, False
+
+
+def release_task_id(redis_client, key: str, task_id: str):
+    """
+    Release a reservation, only if it still points at the given task ID
+    (e.g. when enqueueing the task failed).
+    """
+    try:
+        current = redis_client.get(key)
+        if isinstance(current, bytes):
+            current = current.decode()
+        if current == task_id:
+            redis_client.delete(key)
+            logger.info("Released idempotency key: '%s'", key)
+    except Exception as e:
+        logger.error("Error releasing idempotency key: '%s'. Error: %s", key, str(e))
@@ -0,0 +1,157 @@
+import atexit
+import copy
+import itertools
+import json
+import logging
+import os
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from dotenv import load_dotenv
+
+from app.util.tracing_utilities import current_trace_id
+
+load_dotenv()
+
+# Root log level, e.g. INFO
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# Per-module overrides, e.g. "app.services.tao_staking_service=DEBUG,celery=WARNING"
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+# "json" or "text"
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower()
+# Sampled loggers emit one out of every LOG_SAMPLE_EVERY DEBUG/INFO records
+LOG_SAMPLE_EVERY = int(os.environ.get("LOG_SAMPLE_EVERY", 100))
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [trace_id=%(trace_id)s] %(message)s"
+
+_listener = None
+_queue_handler = None
+_stream_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as single-line JSON objects.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "trace_id": getattr(record, "trace_id", None),
+            "process": record.process,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Attach the active trace ID to each record. Runs in the logging thread of the caller,
+    before the record is handed to the queue, so the trace context is still available.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = current_trace_id()
+        return True
+
+
+class _TracebackQueueHandler(QueueHandler):
+    """
+    QueueHandler that merges the message arguments in the caller's thread but keeps
+    exc_info, so the traceback is formatted by the listener's formatter.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Let through one out of every `every` DEBUG/INFO records, for high-volume per-entry
+    messages. Warnings and errors are never sampled out.
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(every, 1)
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        return next(self._counter) % self.every == 0
+
+
+def get_sampled_logger(name: str) -> logging.Logger:
+    """
+    Return a logger that only emits one out of every LOG_SAMPLE_EVERY DEBUG/INFO records.
+    Level checks still happen first, so disabled records are neither sampled nor formatted.
+    """
+    sampled_logger = logging.getLogger(name)
+    if not any(isinstance(f, SamplingFilter) for f in sampled_logger.filters):
+        sampled_logger.addFilter(SamplingFilter(LOG_SAMPLE_EVERY))
+    return sampled_logger
+
+
+def configure_logging():
+    """
+    Configure application-wide logging once per process: root and per-module levels, JSON or
+    text output, and a QueueHandler so that handler I/O runs on a background listener thread
+    instead of blocking the event loop or the Celery task.
+    """
+    global _queue_handler, _stream_handler
+    if _listener is not None:
+        return
+
+    _stream_handler = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        _stream_handler.setFormatter(JsonFormatter())
+    else:
+        _stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    _queue_handler = _TracebackQueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(TraceContextFilter())
+
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(_queue_handler)
+    root_logger.setLevel(LOG_LEVEL)
+
+    for override in filter(None, (item.strip() for item in LOG_LEVELS.split(","))):
+        name, _, level = override.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    _start_listener()
+
+
+def _start_listener():
+    global _listener
+    _listener = QueueListener(_queue_handler.queue, _stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_in_child():
+    # The listener thread does not survive a fork (e.g. Celery prefork pool children), which
+    # would leave records queued forever. Give the child its own queue and listener.
+    if _listener is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _start_listener()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+atexit.register(_stop_listener)
@@ -0,0 +1,120 @@
+import logging
+
+from dotenv import load_dotenv
+
+from app.util.tracing_utilities import start_span
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)  # Use module-level logging
+
+SUBNET_INDEX_PREFIX = "subnet"
+PERCENTILES = (50, 90, 99)
+
+
+def _ranking_key(netuid: int) -> str:
+    return f"{SUBNET_INDEX_PREFIX}:{netuid}:dividends"
+
+
+def _values_key(netuid: int) -> str:
+    return f"{SUBNET_INDEX_PREFIX}:{netuid}:values"
+
+
+def _stats_key(netuid: int) -> str:
+    return f"{SUBNET_INDEX_PREFIX}:{netuid}:stats"
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def compute_subnet_stats(dividends: list[int]) -> dict:
+    """
+    Compute the aggregates stored with a subnet snapshot: total, count and
+    nearest-rank percentiles of the dividend values.
+    """
+    values = sorted(dividends)
+    stats = {"total": sum(values), "count": len(values)}
+    for p in PERCENTILES:
+        # Nearest-rank percentile; 0 for an empty subnet
+        stats[f"p{p}"] = values[max(-(-p * len(values) // 100) - 1, 0)] if values else 0
+    return stats
+
+
+def store_subnet_snapshots(redis_client, snapshots: dict, ttl: int = 120) -> dict:
+    """
+    Replace the dividend index and aggregates of each netuid in one transaction.
+
+    Only positive dividends are indexed, matching fetch_all_netuids, so the snapshot is the
+    same whichever endpoint refreshed it. The sorted set orders hotkeys by dividend; since its
+    scores are doubles, exact dividend values are kept in a separate hash and returned from it.
+    Ordering between hotkeys whose dividends differ only beyond 2^53 may be inexact.
+
+    :param redis_client: Redis client instance.
+    :param snapshots: Mapping of netuid to a list of (hotkey, dividend) tuples.
+    :param ttl: Time-to-live of the snapshot in seconds.
+    :return: Mapping of netuid to its computed aggregates.
+    """
+    indexed = {
+        netuid: {hotkey: dividend for hotkey, dividend in entries if dividend > 0}
+        for netuid, entries in snapshots.items()
+    }
+    all_stats = {netuid: compute_subnet_stats(list(dividends.values())) for netuid, dividends in indexed.items()}
+
+    try:
+        with start_span("subnet_index.store", netuids=len(indexed)):
+            pipe = redis_client.pipeline(transaction=True)
+            for netuid, dividends in indexed.items():
+                pipe.delete(_ranking_key(netuid), _values_key(netuid), _stats_key(netuid))
+                if dividends:
+                    pipe.zadd(_ranking_key(netuid), dividends)
+                    pipe.hset(_values_key(netuid), mapping=dividends)
+                    pipe.expire(_ranking_key(netuid), ttl)
+                    pipe.expire(_values_key(netuid), ttl)
+                pipe.hset(_stats_key(netuid), mapping=all_stats[netuid])
+                pipe.expire(_stats_key(netuid), ttl)
+            pipe.execute()
+        logger.debug("Stored dividend snapshots for %d netuids with TTL: %d seconds", len(indexed), ttl)
+    except Exception as e:
+        logger.error("Error storing dividend snapshots for netuids: %s. Error: %s", list(indexed), str(e))
+    return all_stats
+
+
+def get_subnet_stats(redis_client, netuid: int) -> dict | None:
+    """
+    Return the precomputed aggregates of a netuid, or None if there is no snapshot.
+    """
+    with start_span("subnet_index.stats", netuid=netuid):
+        raw = redis_client.hgetall(_stats_key(netuid))
+    if not raw:
+        return None
+    return {_decode(k): int(v) for k, v in raw.items()}
+
+
+def get_top_hotkeys(redis_client, netuid: int, n: int) -> list[dict]:
+    """
+    Return the n hotkeys with the highest dividends, in descending order. O(log N + n).
+    """
+    with start_span("subnet_index.top", netuid=netuid, n=n):
+        hotkeys = redis_client.zrevrange(_ranking_key(netuid), 0, n - 1)
+        dividends = redis_client.hmget(_values_key(netuid), hotkeys) if hotkeys else []
+    return [
+        {"hotkey": _decode(hotkey), "dividend": int(dividend)}
+        for hotkey, dividend in zip(hotkeys, dividends)
+        if dividend is not None
+    ]
+
+
+def get_hotkey_rank(redis_client, netuid: int, hotkey: str) -> tuple[int, int] | None:
+    """
+    Return the 1-based rank (highest dividend first) and exact dividend of a hotkey,
+    or None if the hotkey is not in the snapshot. O(log N).
+    """
+    with start_span("subnet_index.rank", netuid=netuid):
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zrevrank(_ranking_key(netuid), hotkey)
+        pipe.hget(_values_key(netuid), hotkey)
+        rank, dividend = pipe.execute()
+    if rank is None or dividend is None:
+        return None
+    return rank + 1, int(dividend)
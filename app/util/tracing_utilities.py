@@ -0,0 +1,205 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)  # Use module-level logging
+
+# Spans are appended as JSON lines to this file (a stand-in for an OTLP collector).
+# Tracing context is still propagated when it is not set, but spans are not exported.
+TRACE_EXPORT_FILE = os.environ.get("TRACE_EXPORT_FILE")
+# Spans waiting to be written beyond this are dropped rather than growing memory
+TRACE_EXPORT_QUEUE_SIZE = int(os.environ.get("TRACE_EXPORT_QUEUE_SIZE", 10000))
+
+TRACEPARENT_HEADER = "traceparent"
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# (trace_id, span_id) of the active span for the current thread/asyncio task
+_current_context: ContextVar[tuple[str, str] | None] = ContextVar("current_trace_context", default=None)
+
+
+class Span:
+    """
+    A single timed operation within a trace, modelled on the OpenTelemetry span data model.
+    """
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.status = "OK"
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def end(self):
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _FileSpanExporter:
+    """
+    Writes finished spans to a file from a background thread, so exporting never blocks
+    the event loop or the Celery task. Spans are written in batches through one open file
+    handle, and dropped (and counted) when the bounded queue is full.
+    """
+
+    _SHUTDOWN = object()
+
+    def __init__(self, path: str, max_queue_size: int = TRACE_EXPORT_QUEUE_SIZE):
+        self.path = path
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self):
+        """
+        Write the spans still queued, then close the file.
+        """
+        self._queue.put(self._SHUTDOWN)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._file.writelines(
+                    json.dumps(record, default=str) + "\n" for record in batch if record is not self._SHUTDOWN
+                )
+                self._file.flush()
+            except Exception as e:
+                logger.error("Error exporting %d spans to %s. Error: %s", len(batch), self.path, str(e))
+
+            if any(record is self._SHUTDOWN for record in batch):
+                self._file.close()
+                return
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def _reset_exporter():
+    # The exporter thread does not survive a fork (e.g. Celery prefork children), so each
+    # child process starts its own exporter on first use.
+    global _exporter, _exporter_lock
+    _exporter = None
+    _exporter_lock = threading.Lock()
+
+
+def _shutdown_exporter():
+    if _exporter is not None:
+        _exporter.shutdown()
+
+
+os.register_at_fork(after_in_child=_reset_exporter)
+atexit.register(_shutdown_exporter)
+
+
+def _export(span: Span):
+    global _exporter
+    if not TRACE_EXPORT_FILE:
+        return
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = _FileSpanExporter(TRACE_EXPORT_FILE)
+    _exporter.export(span)
+
+
+@contextmanager
+def start_span(name: str, **attributes):
+    """
+    Start a span as a child of the active span (or a new trace if there is none).
+    Works in both sync and async code, since the active span is held in a ContextVar.
+    """
+    parent = _current_context.get()
+    trace_id = parent[0] if parent else secrets.token_hex(16)
+    span = Span(name, trace_id, parent[1] if parent else None, attributes)
+    token = _current_context.set((trace_id, span.span_id))
+    try:
+        yield span
+    except Exception as e:
+        span.status = "ERROR"
+        span.set_attribute("error", str(e))
+        raise
+    finally:
+        span.end()
+        _current_context.reset(token)
+        _export(span)
+
+
+def current_trace_id() -> str | None:
+    """
+    Return the trace ID of the active span, or None outside of a trace.
+    """
+    context = _current_context.get()
+    return context[0] if context else None
+
+
+def inject() -> dict:
+    """
+    Serialize the active trace context as a W3C traceparent carrier.
+    """
+    context = _current_context.get()
+    if context is None:
+        return {}
+    return {TRACEPARENT_HEADER: f"00-{context[0]}-{context[1]}-01"}
+
+
+@contextmanager
+def extract(carrier: dict | None):
+    """
+    Make the trace context from a W3C traceparent carrier the parent of spans started
+    inside this block. Invalid or missing carriers start a new trace.
+    """
+    match = _TRACEPARENT_RE.match((carrier or {}).get(TRACEPARENT_HEADER) or "")
+    if match is None:
+        yield
+        return
+    token = _current_context.set((match.group(1), match.group(2)))
+    try:
+        yield
+    finally:
+        _current_context.reset(token)